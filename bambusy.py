@@ -4,14 +4,23 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import functools
 import json
+import mmap
+import shlex
+import socket
 import sys
+import threading
 import time
-from dataclasses import dataclass
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 try:
+    import paho.mqtt.client as mqtt
     from bpm.bambuconfig import BambuConfig
     from bpm.bambuprinter import BambuPrinter
 except Exception as exc:  # pragma: no cover
@@ -20,13 +29,42 @@ except Exception as exc:  # pragma: no cover
     print(f"Details: {exc}")
     sys.exit(2)
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def json_loads(data: Union[bytes, memoryview]) -> Any:
+    # orjson parses a memoryview in place; the stdlib parser needs bytes.
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data))
+
+
+def json_dumps(obj: Any) -> bytes:
+    # Payloads are always bytes so paho publishes them without re-encoding.
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
 
 BIT_BED_LEVELING = 1 << 1  # 2
 BIT_VIBRATION = 1 << 2     # 4
 BIT_MOTOR_NOISE = 1 << 3   # 8
 
+PUBLISH_QOS = 1
+COMPRESSED_TOPIC_SUFFIX = ".z"
+
+HOME_PAYLOAD_JSON = json_dumps({"print": {"command": "home", "sequence_id": "1"}})
 
-@dataclass
+_PRINT_LOCK = threading.Lock()
+_SESSIONS: Dict[Tuple[str, str], BambuPrinter] = {}
+_SESSION_KEY_LOCKS: Dict[Tuple[str, str], threading.Lock] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+@dataclass(slots=True, frozen=True)
 class PrinterEntry:
     id: int
     name: str
@@ -34,9 +72,42 @@ class PrinterEntry:
     serial: str
     access_code: str
     port: int = 8883
+    topic: str = field(init=False, repr=False)
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "topic", f"device/{self.serial}/request")
 
-def parse_args() -> argparse.Namespace:
+
+@dataclass(slots=True, frozen=True)
+class PrinterFleet:
+    printers: List[PrinterEntry]
+    by_id: Dict[int, PrinterEntry]
+
+    def __iter__(self) -> Iterator[PrinterEntry]:
+        return iter(self.printers)
+
+    def __len__(self) -> int:
+        return len(self.printers)
+
+
+_CONFIG_CACHE: Dict[str, Tuple[Tuple[int, int], PrinterFleet]] = {}
+
+
+def non_negative_int(raw: str) -> int:
+    value = int(raw)
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"must be at least 0, got {value}")
+    return value
+
+
+def positive_int(raw: str) -> int:
+    value = int(raw)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="bambusy.py",
         description="One small script to control many Bambu printers over LAN.",
@@ -50,13 +121,28 @@ def parse_args() -> argparse.Namespace:
         "--connect-wait",
         type=float,
         default=2.0,
-        help="Seconds to wait after MQTT session start (default: 2.0)",
+        help="Max seconds to wait for the MQTT connection (default: 2.0)",
     )
     parser.add_argument(
         "--post-wait",
         type=float,
         default=1.0,
-        help="Seconds to wait after sending commands (default: 1.0)",
+        help="Max seconds to wait for commands to be acknowledged (default: 1.0)",
+    )
+    parser.add_argument(
+        "--parallel",
+        type=positive_int,
+        default=1,
+        metavar="N",
+        help="Max printers to talk to at the same time (default: 1)",
+    )
+    parser.add_argument(
+        "--compress-threshold",
+        type=non_negative_int,
+        default=None,
+        metavar="BYTES",
+        help="zlib-compress payloads larger than BYTES and publish them on "
+        "device/<serial>/request.z (default: off; stock firmware ignores that topic)",
     )
     parser.add_argument(
         "--dry-run",
@@ -95,9 +181,15 @@ def parse_args() -> argparse.Namespace:
         help="Legacy mode: include motor noise calibration (used with -c h).",
     )
 
+    parser.set_defaults(keep_sessions=False)
+
     subparsers = parser.add_subparsers(dest="cmd")
 
     subparsers.add_parser("list", help="List printers from config")
+    subparsers.add_parser(
+        "shell",
+        help="Interactive prompt that keeps printer sessions open between commands",
+    )
 
     home = subparsers.add_parser("home", help="Send HOME command")
     home.add_argument(
@@ -130,36 +222,62 @@ def parse_args() -> argparse.Namespace:
         help="Delay between HOME and CALIBRATION command (default: 3.0)",
     )
 
-    return parser.parse_args()
+    return parser
 
 
-def load_config(path: Path) -> List[PrinterEntry]:
-    if not path.exists():
-        raise FileNotFoundError(f"Config file not found: {path}")
+def parse_args() -> argparse.Namespace:
+    return build_parser().parse_args()
+
 
-    with path.open("r", encoding="utf-8") as handle:
-        data = json.load(handle)
+def load_config(path: Path) -> PrinterFleet:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Config file not found: {path}") from None
+
+    cache_key = str(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _CONFIG_CACHE.get(cache_key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with path.open("rb") as handle:
+        if stat.st_size:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    data = json_loads(view)
+        else:
+            data = json_loads(b"")
 
     printers = []
     for item in data.get("printers", []):
         printers.append(
             PrinterEntry(
+                # ids, access codes and ports are commonly written as either
+                # numbers or strings; keep those casts so both forms work
                 id=int(item["id"]),
-                name=str(item.get("name", f"printer-{item['id']}")),
-                host=str(item["host"]),
-                serial=str(item["serial"]),
+                name=item.get("name") or f"printer-{item['id']}",
+                host=item["host"],
+                serial=item["serial"],
                 access_code=str(item["access_code"]),
                 port=int(item.get("port", 8883)),
             )
         )
-    return printers
+    fleet = PrinterFleet(printers=printers, by_id={p.id: p for p in printers})
+    _CONFIG_CACHE[cache_key] = (signature, fleet)
+    return fleet
 
 
 def parse_printer_ids(raw: str) -> List[int]:
-    return [int(chunk.strip()) for chunk in raw.split(",") if chunk.strip()]
+    ids = []
+    for chunk in raw.split(","):
+        value = chunk.strip()
+        if value:
+            ids.append(int(value))
+    return ids
 
 
-def parse_legacy_units(raw: str, printers: List[PrinterEntry]) -> str:
+def parse_legacy_units(raw: str, printers: PrinterFleet) -> str:
     value = raw.strip().lower()
     if value in {"a", "all"}:
         all_ids = [str(p.id) for p in printers]
@@ -173,7 +291,7 @@ def parse_legacy_units(raw: str, printers: List[PrinterEntry]) -> str:
     return ",".join(str(pid) for pid in ids)
 
 
-def build_legacy_dispatch(args: argparse.Namespace, printers: List[PrinterEntry]) -> argparse.Namespace:
+def build_legacy_dispatch(args: argparse.Namespace, printers: PrinterFleet) -> argparse.Namespace:
     if not args.legacy_units or not args.legacy_calibration:
         raise ValueError("Legacy mode requires both -u/--units and -c/--calibration.")
 
@@ -201,6 +319,9 @@ def build_legacy_dispatch(args: argparse.Namespace, printers: List[PrinterEntry]
             dry_run=args.dry_run,
             connect_wait=args.connect_wait,
             post_wait=args.post_wait,
+            parallel=args.parallel,
+            compress_threshold=args.compress_threshold,
+            keep_sessions=args.keep_sessions,
         )
 
     return argparse.Namespace(
@@ -214,6 +335,9 @@ def build_legacy_dispatch(args: argparse.Namespace, printers: List[PrinterEntry]
         dry_run=args.dry_run,
         connect_wait=args.connect_wait,
         post_wait=args.post_wait,
+        parallel=args.parallel,
+        compress_threshold=args.compress_threshold,
+        keep_sessions=args.keep_sessions,
     )
 
 
@@ -228,12 +352,64 @@ def build_calibration_option(bed_leveling: bool, vibration: bool, motor_noise: b
     return option
 
 
-def send_payload(printer: BambuPrinter, serial: str, payload: dict) -> None:
-    topic = f"device/{serial}/request"
-    printer.client.publish(topic, json.dumps(payload))
-
-
-def with_session(entry: PrinterEntry, connect_wait: float) -> BambuPrinter:
+@functools.lru_cache(maxsize=8)
+def calibration_payload_json(option: int) -> bytes:
+    return json_dumps({"print": {"command": "calibration", "sequence_id": "2", "option": option}})
+
+
+def compress_payload(
+    topic: str,
+    payload: bytes,
+    compress_threshold: Optional[int] = None,
+) -> Tuple[str, bytes]:
+    # Bambu firmware only listens on the plain request topic, so compression
+    # is opt-in and meant for consumers that understand the ".z" suffix.
+    if compress_threshold is None or len(payload) <= compress_threshold:
+        return topic, payload
+    return topic + COMPRESSED_TOPIC_SUFFIX, zlib.compress(payload, level=1)
+
+
+def send_payload(
+    printer: BambuPrinter,
+    topic: str,
+    payload: bytes,
+    compress_threshold: Optional[int] = None,
+) -> mqtt.MQTTMessageInfo:
+    topic, payload = compress_payload(topic, payload, compress_threshold)
+    info = printer.client.publish(topic, payload, qos=PUBLISH_QOS)
+    if info.rc != mqtt.MQTT_ERR_SUCCESS:
+        raise RuntimeError(f"publish to {topic} failed: {mqtt.error_string(info.rc)}")
+    return info
+
+
+def wait_for_ack(info: mqtt.MQTTMessageInfo, timeout: float) -> None:
+    # wait_for_publish() just returns on timeout; raise so the printer is
+    # reported as failed and a shell session with a queued message is evicted.
+    info.wait_for_publish(timeout=timeout)
+    if not info.is_published():
+        raise TimeoutError(f"no PUBACK within {timeout}s")
+
+
+def send_payload_batch(
+    printer: BambuPrinter,
+    items: List[Tuple[str, bytes, float, Optional[str]]],
+    timeout: float = 5.0,
+    compress_threshold: Optional[int] = None,
+) -> None:
+    # Stop at the first failed publish so a failed HOME is never followed by
+    # the calibration; only the last message is waited on.
+    info = None
+    for topic, payload, delay_before, label in items:
+        if delay_before > 0:
+            time.sleep(delay_before)
+        if label is not None:
+            _log(label)
+        info = send_payload(printer, topic, payload, compress_threshold)
+    if info is not None:
+        wait_for_ack(info, timeout)
+
+
+def open_session(entry: PrinterEntry, connect_wait: float) -> BambuPrinter:
     cfg = BambuConfig(
         hostname=entry.host,
         access_code=entry.access_code,
@@ -242,11 +418,101 @@ def with_session(entry: PrinterEntry, connect_wait: float) -> BambuPrinter:
     )
     bp = BambuPrinter(config=cfg)
     bp.start_session()
-    time.sleep(connect_wait)
+    if not wait_for_connect(bp, connect_wait):
+        close_session(bp)
+        raise TimeoutError(f"no MQTT connection within {connect_wait}s")
     return bp
 
 
-def cmd_list(printers: List[PrinterEntry]) -> int:
+def wait_for_connect(bp: BambuPrinter, timeout: float) -> bool:
+    # Chain onto bpm's own on_connect (it subscribes to the report topic),
+    # then check is_connected() in case CONNACK arrived before the hook.
+    connected = threading.Event()
+    client = bp.client
+    bpm_on_connect = client.on_connect
+
+    def on_connect(client, userdata, flags, reason_code, properties) -> None:
+        if bpm_on_connect is not None:
+            bpm_on_connect(client, userdata, flags, reason_code, properties)
+        # A refused CONNACK (e.g. wrong access code) is not a connection.
+        if not reason_code.is_failure:
+            connected.set()
+
+    client.on_connect = on_connect
+    if client.is_connected():
+        connected.set()
+    return connected.wait(timeout=timeout)
+
+
+def close_session(bp: BambuPrinter) -> None:
+    # quit() disconnects the client and joins bpm's session and watchdog
+    # threads (paho's loop_stop() does not apply, bpm never calls loop_start()).
+    with contextlib.suppress(Exception):
+        bp.quit()
+
+
+def close_sessions(parallel: int = 1) -> None:
+    with _SESSIONS_LOCK:
+        cached = list(_SESSIONS.values())
+        _SESSIONS.clear()
+    if cached:
+        with ThreadPoolExecutor(max_workers=min(parallel, len(cached))) as executor:
+            list(executor.map(close_session, cached))
+
+
+class BambuSession:
+    """Open an MQTT session for one printer, optionally reusing a cached one.
+
+    With ``keep_alive`` the session is stored per ``(host, serial)`` and left
+    open on exit, so later commands skip the connect and ``connect_wait``.
+    Disconnected sessions are reopened, sessions that raised are evicted, and
+    the rest are closed by :func:`close_sessions`.
+    """
+
+    def __init__(self, entry: PrinterEntry, connect_wait: float, keep_alive: bool = False) -> None:
+        self.entry = entry
+        self.connect_wait = connect_wait
+        self.keep_alive = keep_alive
+        self.printer: Optional[BambuPrinter] = None
+
+    def __enter__(self) -> BambuPrinter:
+        if not self.keep_alive:
+            self.printer = open_session(self.entry, self.connect_wait)
+            return self.printer
+
+        key = (self.entry.host, self.entry.serial)
+        with _SESSIONS_LOCK:
+            key_lock = _SESSION_KEY_LOCKS.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with _SESSIONS_LOCK:
+                cached = _SESSIONS.pop(key, None)
+            if cached is not None and cached.client.is_connected():
+                self.printer = cached
+            else:
+                if cached is not None:
+                    close_session(cached)
+                self.printer = open_session(self.entry, self.connect_wait)
+            with _SESSIONS_LOCK:
+                _SESSIONS[key] = self.printer
+        return self.printer
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.printer is None:
+            return
+        if self.keep_alive and exc_type is None:
+            return
+        if self.keep_alive:
+            # Drop failed sessions so queued QoS 1 messages are not sent later
+            # and the next command reconnects.
+            key = (self.entry.host, self.entry.serial)
+            with _SESSIONS_LOCK:
+                if _SESSIONS.get(key) is self.printer:
+                    del _SESSIONS[key]
+        close_session(self.printer)
+
+
+def cmd_list(printers: PrinterFleet) -> int:
     if not printers:
         print("No printers in config.")
         return 1
@@ -257,45 +523,101 @@ def cmd_list(printers: List[PrinterEntry]) -> int:
     return 0
 
 
-def select_printers(printers: List[PrinterEntry], requested_ids: List[int]) -> List[PrinterEntry]:
-    by_id = {p.id: p for p in printers}
-    missing = [pid for pid in requested_ids if pid not in by_id]
+def _resolve_host(host: str) -> Optional[str]:
+    try:
+        return socket.gethostbyname(host)
+    except OSError:
+        return None
+
+
+def resolve_hosts(targets: List[PrinterEntry], parallel: int) -> List[PrinterEntry]:
+    # Resolved once per command, not cached across shell commands, so a
+    # printer that got a new DHCP address is picked up on the next command.
+    hosts = sorted({entry.host for entry in targets})
+    with ThreadPoolExecutor(max_workers=min(parallel, len(hosts))) as executor:
+        resolved = dict(zip(hosts, executor.map(_resolve_host, hosts)))
+    # Unresolved hosts are passed through so the MQTT connect reports the error.
+    return [replace(entry, host=resolved[entry.host] or entry.host) for entry in targets]
+
+
+def select_printers(printers: PrinterFleet, requested_ids: List[int]) -> List[PrinterEntry]:
+    by_id = printers.by_id
+    missing = set(requested_ids).difference(by_id)
     if missing:
-        raise ValueError(f"Unknown printer ID(s): {missing}")
-    return [by_id[pid] for pid in requested_ids]
+        raise ValueError(f"Unknown printer ID(s): {sorted(missing)}")
+    # A printer listed twice would otherwise get two sessions in one run.
+    return [by_id[pid] for pid in dict.fromkeys(requested_ids)]
+
+
+def _log(message: str) -> None:
+    with _PRINT_LOCK:
+        print(message)
+
+
+def _run_targets(
+    targets: List[PrinterEntry],
+    worker: Callable[[PrinterEntry], None],
+    parallel: int,
+) -> None:
+    with ThreadPoolExecutor(max_workers=min(parallel, len(targets))) as executor:
+        futures = {executor.submit(worker, entry): entry for entry in targets}
+        for future in as_completed(futures):
+            entry = futures[future]
+            exc = future.exception()
+            if exc is None:
+                _log(f"[{entry.id}] OK")
+            else:
+                _log(f"[{entry.id}] FAILED: {exc}")
+
+
+def _run_home(entry: PrinterEntry, args: argparse.Namespace, payload: bytes) -> None:
+    with BambuSession(entry, args.connect_wait, args.keep_sessions) as bp:
+        info = send_payload(bp, entry.topic, payload, args.compress_threshold)
+        wait_for_ack(info, args.post_wait)
+
+
+def _run_calibrate(
+    entry: PrinterEntry,
+    args: argparse.Namespace,
+    option: int,
+    home_json: bytes,
+    cal_json: bytes,
+) -> None:
+    items = [(entry.topic, home_json, 0.0, None)]
+    if not args.home_only:
+        label = f"[{entry.id}] {entry.name}: CALIBRATION option={option}"
+        items.append((entry.topic, cal_json, args.calibration_delay, label))
+
+    with BambuSession(entry, args.connect_wait, args.keep_sessions) as bp:
+        send_payload_batch(
+            bp,
+            items,
+            timeout=args.post_wait,
+            compress_threshold=args.compress_threshold,
+        )
 
 
-def cmd_home(args: argparse.Namespace, printers: List[PrinterEntry]) -> int:
+def cmd_home(args: argparse.Namespace, printers: PrinterFleet) -> int:
     requested = parse_printer_ids(args.printers)
     targets = select_printers(printers, requested)
 
-    home_payload = {"print": {"command": "home", "sequence_id": "1"}}
-
     for entry in targets:
         print(f"[{entry.id}] {entry.name}: HOME")
         if args.dry_run:
-            print(json.dumps(home_payload))
-            continue
-
-        bp = None
-        try:
-            bp = with_session(entry, args.connect_wait)
-            send_payload(bp, entry.serial, home_payload)
-            time.sleep(args.post_wait)
-            print(f"[{entry.id}] OK")
-        except Exception as exc:
-            print(f"[{entry.id}] FAILED: {exc}")
-        finally:
-            if bp is not None:
-                try:
-                    bp.quit()
-                except Exception:
-                    pass
+            print(HOME_PAYLOAD_JSON.decode("utf-8"))
+
+    if not args.dry_run and targets:
+        targets = resolve_hosts(targets, args.parallel)
+        _run_targets(
+            targets,
+            lambda entry: _run_home(entry, args, HOME_PAYLOAD_JSON),
+            args.parallel,
+        )
 
     return 0
 
 
-def cmd_calibrate(args: argparse.Namespace, printers: List[PrinterEntry]) -> int:
+def cmd_calibrate(args: argparse.Namespace, printers: PrinterFleet) -> int:
     requested = parse_printer_ids(args.printers)
     targets = select_printers(printers, requested)
 
@@ -305,46 +627,110 @@ def cmd_calibrate(args: argparse.Namespace, printers: List[PrinterEntry]) -> int
         print("Nothing to calibrate: choose at least one option or use --home-only.")
         return 1
 
-    home_payload = {"print": {"command": "home", "sequence_id": "1"}}
-    cal_payload = {"print": {"command": "calibration", "sequence_id": "2", "option": option}}
+    home_json = HOME_PAYLOAD_JSON
+    cal_json = calibration_payload_json(option)
 
     for entry in targets:
         print(f"[{entry.id}] {entry.name}: HOME")
         if args.dry_run:
-            print(json.dumps(home_payload))
+            print(home_json.decode("utf-8"))
             if not args.home_only:
                 print(f"wait {args.calibration_delay}s")
-                print(json.dumps(cal_payload))
-            continue
+                print(cal_json.decode("utf-8"))
+
+    if not args.dry_run and targets:
+        targets = resolve_hosts(targets, args.parallel)
+        _run_targets(
+            targets,
+            lambda entry: _run_calibrate(entry, args, option, home_json, cal_json),
+            args.parallel,
+        )
 
-        bp = None
-        try:
-            bp = with_session(entry, args.connect_wait)
-            send_payload(bp, entry.serial, home_payload)
+    return 0
+
+
+CMD_TABLE: Dict[str, Callable[[argparse.Namespace, PrinterFleet], int]] = {
+    "list": lambda args, printers: cmd_list(printers),
+    "home": cmd_home,
+    "calibrate": cmd_calibrate,
+}
 
-            if not args.home_only:
-                time.sleep(args.calibration_delay)
-                print(f"[{entry.id}] {entry.name}: CALIBRATION option={option}")
-                send_payload(bp, entry.serial, cal_payload)
-
-            time.sleep(args.post_wait)
-            print(f"[{entry.id}] OK")
-        except Exception as exc:
-            print(f"[{entry.id}] FAILED: {exc}")
-        finally:
-            if bp is not None:
-                try:
-                    bp.quit()
-                except Exception:
-                    pass
 
+def cmd_shell(args: argparse.Namespace) -> int:
+    parser = build_parser()
+    print("bambusy shell: list/home/calibrate keep sessions open. Type 'exit' to quit.")
+
+    # Not atexit: Python joins bpm's non-daemon session threads before it runs
+    # atexit handlers, so an interrupted shell would hang instead of closing.
+    try:
+        while True:
+            try:
+                line = input("bambusy> ")
+            except EOFError:
+                print()
+                break
+            except KeyboardInterrupt:
+                print()
+                continue
+
+            try:
+                tokens = shlex.split(line)
+            except ValueError as exc:
+                print(f"Error: {exc}")
+                continue
+            if not tokens:
+                continue
+            if tokens[0] in {"exit", "quit"}:
+                break
+
+            base = argparse.Namespace(
+                config=args.config,
+                connect_wait=args.connect_wait,
+                post_wait=args.post_wait,
+                parallel=args.parallel,
+                compress_threshold=args.compress_threshold,
+                dry_run=args.dry_run,
+                keep_sessions=True,
+            )
+            try:
+                sub_args = parser.parse_args(tokens, namespace=base)
+            except SystemExit:
+                continue
+            if sub_args.cmd == "shell":
+                print("Already in shell.")
+                continue
+
+            try:
+                printers = load_config(Path(sub_args.config))
+                run_command(sub_args, printers)
+            except Exception as exc:
+                print(f"Error: {exc}")
+    finally:
+        close_sessions(args.parallel)
     return 0
 
 
+def run_command(args: argparse.Namespace, printers: PrinterFleet) -> int:
+    if args.cmd is None and (args.legacy_units or args.legacy_calibration):
+        args = build_legacy_dispatch(args, printers)
+
+    handler = CMD_TABLE.get(args.cmd)
+    if handler is not None:
+        return handler(args, printers)
+    if args.cmd is None:
+        print("No command given. Use list/home/calibrate/shell or legacy mode: -u ... -c ...")
+        return 1
+    print(f"Unknown command: {args.cmd}")
+    return 1
+
+
 def main() -> int:
     args = parse_args()
     config_path = Path(args.config)
 
+    if args.cmd == "shell":
+        return cmd_shell(args)
+
     try:
         printers = load_config(config_path)
     except Exception as exc:
@@ -352,20 +738,7 @@ def main() -> int:
         return 1
 
     try:
-        if args.cmd is None and (args.legacy_units or args.legacy_calibration):
-            args = build_legacy_dispatch(args, printers)
-
-        if args.cmd == "list":
-            return cmd_list(printers)
-        if args.cmd == "home":
-            return cmd_home(args, printers)
-        if args.cmd == "calibrate":
-            return cmd_calibrate(args, printers)
-        if args.cmd is None:
-            print("No command given. Use list/home/calibrate or legacy mode: -u ... -c ...")
-            return 1
-        print(f"Unknown command: {args.cmd}")
-        return 1
+        return run_command(args, printers)
     except Exception as exc:
         print(f"Error: {exc}")
         return 1